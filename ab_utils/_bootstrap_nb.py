@@ -0,0 +1,112 @@
+import numpy as np
+from numba import njit, prange
+
+
+# Число перестановок в блоке: блоки распределяются по потокам, и каждый блок
+# переиспользует один буфер, а не копирует объединённую выборку на каждую перестановку
+_BLOCK: int = 256
+
+
+@njit(cache = True)
+def _partial_shuffle(buf: np.ndarray, u: np.ndarray, swaps: np.ndarray) -> None:
+    """
+    Частичный алгоритм Фишера-Йетса: перемешивает только первые len(u) позиций буфера.
+
+    После вызова первые len(u) элементов — случайная выборка без возвращения
+    из всего буфера, остальные элементы — дополнение к ней. Случайность берётся
+    из готовых равномерных чисел u ∈ [0, 1), выбранные позиции пишутся в swaps.
+    """
+    n = len(buf)
+    for j in range(len(u)):
+        r = j + int(u[j] * (n - j))
+        swaps[j] = r
+        buf[j], buf[r] = buf[r], buf[j]
+
+
+@njit(cache = True)
+def _restore(buf: np.ndarray, swaps: np.ndarray) -> None:
+    """
+    Отменяет перестановки `_partial_shuffle` (в обратном порядке), возвращая буфер
+    в исходное состояние — так один буфер переиспользуется без копирования.
+    """
+    for j in range(len(swaps) - 1, -1, -1):
+        r = swaps[j]
+        buf[j], buf[r] = buf[r], buf[j]
+
+
+@njit(parallel = True, cache = True)
+def _perm_mean_diff(pooled: np.ndarray, n_x: int, u: np.ndarray) -> np.ndarray:
+    """
+    Перестановочные статистики mean(x*) - mean(y*) для объединённой выборки pooled.
+
+    Строка i матрицы u (форма (reps, n_x)) — равномерные числа для i-й перестановки;
+    они генерируются заранее в NumPy, поэтому результат не зависит от числа потоков.
+    """
+    reps = u.shape[0]
+    n = len(pooled)
+    n_y = n - n_x
+
+    S = 0.0
+    for j in range(n):
+        S += pooled[j]
+
+    T_stats = np.empty(reps)
+
+    for b in prange((reps + _BLOCK - 1) // _BLOCK):
+        buf = pooled.copy()
+        swaps = np.empty(n_x, dtype = np.int64)
+        for i in range(b * _BLOCK, min((b + 1) * _BLOCK, reps)):
+            _partial_shuffle(buf, u[i], swaps)
+
+            sx = 0.0
+            for j in range(n_x):
+                sx += buf[j]
+            # Та же формула, что и для T_obs = mean(x) - mean(y), без fastmath: на дискретных
+            # данных T* и T_obs должны совпадать побитово, иначе часть равенств теряется
+            T_stats[i] = sx / n_x - (S - sx) / n_y
+
+            _restore(buf, swaps)
+
+    return T_stats
+
+
+@njit(parallel = True, cache = True)
+def _perm_median_diff(pooled: np.ndarray, n_x: int, u: np.ndarray) -> np.ndarray:
+    """
+    Перестановочные статистики median(x*) - median(y*) для объединённой выборки pooled.
+    """
+    reps = u.shape[0]
+    T_stats = np.empty(reps)
+
+    for b in prange((reps + _BLOCK - 1) // _BLOCK):
+        buf = pooled.copy()
+        swaps = np.empty(n_x, dtype = np.int64)
+        for i in range(b * _BLOCK, min((b + 1) * _BLOCK, reps)):
+            _partial_shuffle(buf, u[i], swaps)
+            T_stats[i] = np.median(buf[:n_x]) - np.median(buf[n_x:])
+            _restore(buf, swaps)
+
+    return T_stats
+
+
+@njit(parallel = True, cache = True)
+def _perm_var_diff(pooled: np.ndarray, n_x: int, u: np.ndarray) -> np.ndarray:
+    """
+    Перестановочные статистики var(x*) - var(y*) для объединённой выборки pooled
+    (смещённая дисперсия, как у np.var по умолчанию).
+    """
+    reps = u.shape[0]
+    T_stats = np.empty(reps)
+
+    for b in prange((reps + _BLOCK - 1) // _BLOCK):
+        buf = pooled.copy()
+        swaps = np.empty(n_x, dtype = np.int64)
+        for i in range(b * _BLOCK, min((b + 1) * _BLOCK, reps)):
+            _partial_shuffle(buf, u[i], swaps)
+            # Без fastmath: T* должны совпадать побитово с T_obs и с AOT-версией ядра,
+            # иначе на дискретных данных часть равенств переходит через T_obs
+            T_stats[i] = np.var(buf[:n_x]) - np.var(buf[n_x:])
+            _restore(buf, swaps)
+
+    return T_stats
+
@@ -0,0 +1,40 @@
+"""
+Ahead-of-time компиляция ядер перестановочного теста через numba.pycc.
+
+JIT-компиляция Numba-ядер занимает сотни миллисекунд при первом вызове в каждом
+новом процессе. Скомпилированное заранее расширение `_bootstrap_aot` импортируется
+как обычный C-модуль, но его ядра однопоточные (numba.pycc не поддерживает parallel=True).
+`permutation_test_pvalue` использует их, только когда Numba не установлена или работает
+в одном потоке (NUMBA_NUM_THREADS=1); иначе предпочтительны параллельные JIT-ядра.
+
+Сборка (из корня репозитория, после установки зависимостей):
+    python -m ab_utils._compile
+
+После изменения ядер в _bootstrap_nb.py нужно увеличить `_AOT_VERSION` в bootstrap.py
+и пересобрать расширение: модуль другой версии не загружается.
+"""
+import os
+
+from numba.pycc import CC
+
+from ._bootstrap_nb import _perm_mean_diff, _perm_median_diff, _perm_var_diff
+from .bootstrap import _AOT_VERSION
+
+
+cc = CC('_bootstrap_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Сигнатуры совпадают с тем, как ядра вызываются из permutation_test_pvalue
+cc.export('perm_mean_diff', 'f8[:](f8[:], i8, f8[:, :])')(_perm_mean_diff.py_func)
+cc.export('perm_median_diff', 'f8[:](f8[:], i8, f8[:, :])')(_perm_median_diff.py_func)
+cc.export('perm_var_diff', 'f8[:](f8[:], i8, f8[:, :])')(_perm_var_diff.py_func)
+
+
+@cc.export('aot_version', 'i8()')
+def _aot_version() -> int:
+    return _AOT_VERSION
+
+
+if __name__ == '__main__':
+    cc.compile()
+
@@ -1,4 +1,7 @@
 import scipy.stats as st
+from functools import lru_cache
+from scipy.special import betainc
+from typing import Callable
 
 
 def binomial_p_value(k: int, n: int, p0: float, alternative: str = 'two-sided') -> float:
@@ -25,13 +28,105 @@ def binomial_p_value(k: int, n: int, p0: float, alternative: str = 'two-sided')
     return res.pvalue
 
 
+def _binom_cdf(k: int, n: int, p0: float) -> float:
+    """
+    CDF биномиального распределения P(X ≤ k) через регуляризованную неполную бета-функцию.
+
+    Эквивалентна st.binom.cdf, но вызывает ufunc напрямую, без накладных расходов scipy.stats.
+    """
+    if k < 0:
+        return 0.0
+    if k >= n:
+        return 1.0
+    return betainc(n - k, k + 1, 1 - p0)
+
+
+def _binom_sf(k: int, n: int, p0: float) -> float:
+    """
+    Функция выживания биномиального распределения P(X > k) через регуляризованную
+    неполную бета-функцию. Эквивалентна st.binom.sf.
+    """
+    if k < 0:
+        return 1.0
+    if k >= n:
+        return 0.0
+    return betainc(k + 1, n - k, p0)
+
+
+@lru_cache(maxsize = 4096)
+def _two_sided_p_value(k: int, n: int, p0: float) -> float:
+    """
+    Точное двустороннее p-значение биномиального теста (см. `binomial_p_value_manual`).
+
+    Результат кэшируется по (k, n, p0).
+    """
+    # Суммируем вероятности исходов, не более вероятных, чем наблюдаемый.
+    # PMF унимодальна, поэтому такие исходы образуют два хвоста
+    # по разные стороны от моды: один начинается в k, границу другого ищем бинарным поиском.
+    mode: int = min(int((n + 1) * p0), n)
+
+    # Наблюдаемый исход — мода: в сумму входят все исходы, PMF вычислять не нужно
+    if k == mode:
+        return 1.0
+
+    # Вычисляем вероятность наблюдаемого числа успехов k при H₀ (единственный раз).
+    # Относительный допуск 1e-7 нужен, чтобы исходы с равной вероятностью не терялись из-за округления
+    p_obs: float = st.binom.pmf(k, n, p0)
+    if p_obs > 0:
+        pmf, thr = st.binom.pmf, p_obs * (1 + 1e-7)
+    else:
+        # В далёком хвосте PMF исчезает в машинный ноль, и исходы с разной вероятностью
+        # становятся неразличимы — тогда сравниваем в лог-шкале. Всегда использовать логарифмы
+        # нельзя: при больших n logpmf заметно грубее самой PMF
+        pmf, thr = st.binom.logpmf, st.binom.logpmf(k, n, p0) + 1e-7
+
+    if k < mode:
+        # Наименьший j ∈ [mode, n] с pmf(j) ≤ pmf(k) (n + 1, если такого нет)
+        lo, hi = mode, n + 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if pmf(mid, n, p0) <= thr:
+                hi = mid
+            else:
+                lo = mid + 1
+        p_value = _binom_cdf(k, n, p0) + _binom_sf(lo - 1, n, p0)
+    else:
+        # Наибольший j ∈ [0, mode] с pmf(j) ≤ pmf(k) (−1, если такого нет)
+        lo, hi = -1, mode
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if pmf(mid, n, p0) <= thr:
+                lo = mid
+            else:
+                hi = mid - 1
+        p_value = _binom_cdf(lo, n, p0) + _binom_sf(k - 1, n, p0)
+
+    p_value = min(p_value, 1.0)
+
+    return p_value
+
+
+# P-значение биномиального теста по направлению альтернативы
+_BINOM_TAILS: dict[str, Callable] = {
+    # Для двусторонней проверки используем кэшированный расчёт:
+    # в симуляциях мощности одни и те же (k, n, p0) повторяются многократно
+    'two-sided': _two_sided_p_value,
+    # Суммируем вероятности всех исходов ≤ k. CDF - Cummulative Distribution Function
+    'less': _binom_cdf,
+    # Суммируем вероятности всех исходов ≥ k. SF - Survival Function = 1 - Cummulative Distribution Function
+    'greater': lambda k, n, p0: _binom_sf(k - 1, n, p0),
+}
+
+
 def binomial_p_value_manual(k: int, n: int, p0: float, alternative: str = 'two-sided') -> float:
     """
     Ручной расчёт точного p-значения биномиального теста.
 
     P-значение вычисляется как сумма вероятностей всех исходов,
     вероятность которых меньше или равна вероятности наблюдаемого
-    исхода k при нулевой гипотезе H₀: p = p₀.
+    исхода k при нулевой гипотезе H₀: p = p₀. Граница противоположного
+    хвоста ищется бинарным поиском, поэтому расчёт требует O(log n)
+    вычислений PMF и не строит массив вероятностей всех исходов.
 
     Args:
         k (int): Число наблюдённых успехов.
@@ -45,22 +140,24 @@ def binomial_p_value_manual(k: int, n: int, p0: float, alternative: str = 'two-s
     Returns:
         float: Точное p-значение, рассчитанное вручную.
     """
-    # Вычисляем вероятность наблюдаемого числа успехов k при H₀
-    p_obs: float = st.binom.pmf(k, n, p0)
+    # Выбираем формулу p-значения сразу: неизвестная альтернатива даёт KeyError
+    # и в вырожденных случаях ниже
+    tail = _BINOM_TAILS[alternative]
 
-    # Обработка односторонних гипотез
-    if alternative == 'less':
-        # Суммируем вероятности всех исходов ≤ k. CDF - Cummulative Distribution Function
-        p_value: float = st.binom.cdf(k, n, p0)
-    elif alternative == 'greater':
-        # Суммируем вероятности всех исходов ≥ k. SF - Survival Function = 1 - Cummulative Distribution Function
-        p_value = st.binom.sf(k - 1, n, p0)
-    else:
-        # Для двусторонней проверки:
-        # 1. Вычисляем вероятности для всех возможных исходов. PMF - Probability Mass Function
-        probs = st.binom.pmf(range(n + 1), n, p0)
-        # 2. Выбираем исходы, вероятность которых ≤ наблюдаемой
-        p_value = probs[probs <= p_obs].sum()
+    # Вырожденные случаи (частые при нулевых конверсиях в малых группах) считаются без scipy
+    if p0 == 0:
+        # При H₀ всегда X = 0: любой k > 0 невозможен
+        return 1.0 if alternative == 'less' or k == 0 else 0.0
+    if p0 == 1:
+        # При H₀ всегда X = n: любой k < n невозможен
+        return 1.0 if alternative == 'greater' or k == n else 0.0
+    if k == 0 and alternative == 'less':
+        return (1 - p0) ** n
+    if k == n and alternative == 'greater':
+        return p0 ** n
+
+    # Вычисляем p-значение в зависимости от направления альтернативы
+    p_value: float = tail(k, n, p0)
 
     return p_value
 
@@ -1,14 +1,95 @@
+import warnings
+
 import numpy as np
-from typing import Callable, Tuple
+from typing import Callable, Optional, Tuple
 from tqdm import tqdm
 
 
+# Версия заранее скомпилированного модуля ядер (см. ab_utils/_compile.py). Увеличивается
+# при каждом изменении сигнатур или семантики ядер: pycc не проверяет типы аргументов,
+# и вызов ядра, собранного под прежнюю сигнатуру, может аварийно завершить процесс
+_AOT_VERSION: int = 3
+
+try:
+    from numba import get_num_threads
+
+    from ._bootstrap_nb import _perm_mean_diff, _perm_median_diff, _perm_var_diff
+
+    # Параллельные JIT-ядра Numba для распространённых метрик
+    _JIT_KERNELS: dict = {
+        np.mean: _perm_mean_diff,
+        np.median: _perm_median_diff,
+        np.var: _perm_var_diff,
+    }
+except ImportError:  # numba не установлен — используем реализацию на NumPy
+    _JIT_KERNELS = {}
+
+try:
+    # Заранее скомпилированные ядра не требуют JIT при импорте, но однопоточные
+    from ._bootstrap_aot import aot_version, perm_mean_diff, perm_median_diff, perm_var_diff
+
+    if aot_version() != _AOT_VERSION:
+        raise ImportError('ab_utils._bootstrap_aot собран для другой версии ядер')
+
+    _AOT_KERNELS: dict = {
+        np.mean: perm_mean_diff,
+        np.median: perm_median_diff,
+        np.var: perm_var_diff,
+    }
+except ImportError as e:
+    if not isinstance(e, ModuleNotFoundError):
+        # Модуль есть, но устарел — не используем его и просим пересобрать расширение
+        warnings.warn(f'{e}; пересоберите его: python -m ab_utils._compile')
+    _AOT_KERNELS = {}
+
+
+def _select_kernel(metric_func: Callable) -> Optional[Callable]:
+    """
+    Выбирает скомпилированное ядро для метрики или None, если его нет.
+
+    Параллельное JIT-ядро используется, когда Numba доступно больше одного потока;
+    иначе — однопоточное AOT-ядро (оно не требует JIT-компиляции), а без него — JIT-ядро.
+    """
+    if metric_func in _JIT_KERNELS and get_num_threads() > 1:
+        return _JIT_KERNELS[metric_func]
+    return _AOT_KERNELS.get(metric_func, _JIT_KERNELS.get(metric_func))
+
+
+# Число элементов в одном пакете перестановок (ограничивает память под ключи и индексы)
+_BATCH_SIZE: int = 2 ** 22
+
+# P-value перестановочного теста (доля перестановочных статистик не менее экстремальных,
+# чем наблюдаемая) по направлению альтернативной гипотезы
+_PERM_TAILS: dict[str, Callable] = {
+    'two-sided': lambda T_stats, T_obs: np.mean(np.abs(T_stats) >= np.abs(T_obs)),
+    'greater': lambda T_stats, T_obs: np.mean(T_stats >= T_obs),
+    'less': lambda T_stats, T_obs: np.mean(T_stats <= T_obs),
+}
+
+
+def _group_indices(rng: np.random.Generator, size: int, n: int, n_x: int) -> np.ndarray:
+    """
+    Генерирует пакет случайных разбиений объединённой выборки на группы.
+
+    Вместо полного перемешивания каждой строки используется частичная сортировка
+    случайных ключей (argpartition, O(n) на строку): нужен лишь состав группы x,
+    а не порядок элементов внутри групп.
+
+    Returns:
+        np.ndarray: Матрица индексов формы (size, n); первые n_x индексов
+        в каждой строке относятся к группе x, остальные — к группе y.
+    """
+    keys = rng.random((size, n), dtype = np.float32)
+    return np.argpartition(keys, n_x - 1, axis = 1)
+
+
 def permutation_test_pvalue(
     x: np.ndarray,
     y: np.ndarray,
     metric_func: Callable[[np.ndarray], float] = np.mean,
     reps: int = 10000,
-    alternative: str = 'two-sided'
+    alternative: str = 'two-sided',
+    progress: bool = False
 ) -> Tuple[float, float, np.ndarray]:
     """
     Выполняет перестановочный тест (Permutation Test) для оценки различий
@@ -30,7 +111,8 @@ def permutation_test_pvalue(
         y (np.ndarray): Вторая выборка наблюдений.
         metric_func (Callable[[np.ndarray], float], optional): 
             Функция метрики, вычисляющая значение по выборке.
-            По умолчанию используется `np.mean`.
+            По умолчанию используется `np.mean`. Для `np.mean`, `np.median`
+            и `np.var` при установленном numba используются скомпилированные ядра.
         reps (int, optional): Количество перестановок (итераций). 
             Чем больше `reps`, тем точнее оценка p-value.
             По умолчанию 10_000.
@@ -38,6 +120,8 @@ def permutation_test_pvalue(
             - `'two-sided'` (по умолчанию): H₁: разность ≠ 0
             - `'greater'`: H₁: разность > 0
             - `'less'`: H₁: разность < 0
+        progress (bool, optional): Показывать ли индикатор прогресса (tqdm)
+            для метрик без быстрого пути. По умолчанию False.
 
     Returns:
         Tuple[float, float, np.ndarray]:
@@ -51,6 +135,10 @@ def permutation_test_pvalue(
         >>> p, T_obs, T_stats = permutation_test_pvalue(x, y)
         >>> print(f"T_obs = {T_obs:.3f}, p-value = {p:.4f}")
     """
+    # Выбираем формулу p-value сразу: неизвестная альтернатива даёт KeyError
+    # до расчёта перестановок, а не после
+    tail = _PERM_TAILS[alternative]
+
     # Преобразуем входные данные в массивы NumPy
     x = np.asarray(x)
     y = np.asarray(y)
@@ -60,28 +148,61 @@ def permutation_test_pvalue(
 
     # Объединяем выборки и задаём параметры перестановок
     pooled = np.concatenate([x, y])
+    n: int = len(pooled)
     n_x: int = len(x)
+    n_y: int = n - n_x
 
     # Используем генератор случайных чисел для воспроизводимости
     rng = np.random.default_rng(42)
 
-    # Инициализируем массив для хранения статистик перестановок
-    T_stats = np.empty(reps)
+    # Перестановки обрабатываются пакетами, чтобы ограничить объём памяти
+    batch: int = max(1, _BATCH_SIZE // n)
+
+    kernel = _select_kernel(metric_func)
+
+    if kernel is not None:
+        # Перемешивание и расчёт метрики в скомпилированном коде параллельно по ядрам.
+        # Случайные числа генерирует NumPy в основном потоке (по n_x на перестановку),
+        # поэтому потоки не делят состояние генератора и результат воспроизводим
+        pooled = pooled.astype(np.float64, copy = False)
+        T_stats = np.empty(reps)
+        batch_nb: int = max(1, _BATCH_SIZE // n_x)
+
+        for start in range(0, reps, batch_nb):
+            stop = min(start + batch_nb, reps)
+            T_stats[start:stop] = kernel(pooled, n_x, rng.random((stop - start, n_x)))
+    elif metric_func is np.mean:
+        # Быстрый путь для среднего: сумма объединённой выборки постоянна, поэтому
+        # mean(x*) - mean(y*) = sum(x*) / n_x - (S - sum(x*)) / n_y.
+        # Расчёт ведётся в float64 по той же формуле, что и T_obs: на дискретных данных
+        # (конверсии 0/1) многие T* в точности равны T_obs, и округление (например, до float32)
+        # сдвигало бы часть этих совпадений, занижая p-value
+        S: float = pooled.sum()
+        T_stats = np.empty(reps)
+
+        for start in range(0, reps, batch):
+            stop = min(start + batch, reps)
+            idx = _group_indices(rng, stop - start, n, n_x)[:, :n_x]
+            # Сумма по строкам попарная (pairwise) и потому точная; np.add.reduceat по плоскому
+            # массиву быстрее лишь на малых выборках, а суммирует последовательно
+            sx = pooled[idx].sum(axis = 1)
+            T_stats[start:stop] = sx / n_x - (S - sx) / n_y
+    else:
+        T_stats = np.empty(reps)
 
-    # Генерируем перестановки
-    for i in tqdm(range(reps)):
-        rng.shuffle(pooled)  # Перемешиваем объединённую выборку
-        x_ = pooled[:n_x]    # Первая часть после перемешивания
-        y_ = pooled[n_x:]    # Вторая часть
-        T_stats[i] = metric_func(x_) - metric_func(y_)  # Новая разность метрик
+        # Общий случай: разбиваем сразу пакет копий объединённой выборки
+        with tqdm(total = reps, disable = not progress) as pbar:
+            for start in range(0, reps, batch):
+                stop = min(start + batch, reps)
+                shuffled = pooled[_group_indices(rng, stop - start, n, n_x)]
+                for i, row in enumerate(shuffled, start = start):
+                    x_ = row[:n_x]    # Первая часть после перемешивания
+                    y_ = row[n_x:]    # Вторая часть
+                    T_stats[i] = metric_func(x_) - metric_func(y_)  # Новая разность метрик
+                pbar.update(stop - start)
 
     # Оценка p-value в зависимости от направления альтернативной гипотезы
-    if alternative == 'two-sided':
-        p: float = np.mean(np.abs(T_stats) >= np.abs(T_obs))
-    elif alternative == 'greater':
-        p = np.mean(T_stats >= T_obs)
-    else:  # 'less'
-        p = np.mean(T_stats <= T_obs)
+    p: float = tail(T_stats, T_obs)
 
     return p, T_obs, T_stats
 
@@ -1,5 +1,20 @@
 import numpy as np
+from typing import Callable
 import scipy.stats as st
+from scipy.special import stdtr
+
+
+# P-значение t-теста по направлению альтернативы.
+# stdtr(df, t) — CDF распределения Стьюдента без накладных расходов scipy.stats;
+# хвосты считаются через отрицательный аргумент, чтобы не терять точность при больших |t|
+_T_TAILS: dict[str, Callable] = {
+    # Двусторонний тест: учитываем обе стороны распределения
+    'two-sided': lambda t_stat, df: 2 * stdtr(df, -np.abs(t_stat)),
+    # Правая сторона: вероятность получить t больше наблюдаемого
+    'greater': lambda t_stat, df: stdtr(df, -t_stat),
+    # Левая сторона: вероятность получить t меньше наблюдаемого
+    'less': lambda t_stat, df: stdtr(df, t_stat),
+}
 
 
 def onesample_t_stat(x: np.ndarray, mu0: float) -> tuple[float, int, float]:
@@ -70,15 +85,7 @@ def onesample_p_value_manual(
     t_stat, df, _ = onesample_t_stat(x, mu0)
 
     # Вычисляем p-значение в зависимости от направления альтернативы
-    if alternative == 'two-sided':
-        # Двусторонний тест: учитываем обе стороны распределения
-        p: float = 2 * (1 - st.t.cdf(abs(t_stat), df))
-    elif alternative == 'greater':
-        # Правая сторона: вероятность получить t больше наблюдаемого
-        p = 1 - st.t.cdf(t_stat, df)
-    else:
-        # Левая сторона: вероятность получить t меньше наблюдаемого
-        p = st.t.cdf(t_stat, df)
+    p = _T_TAILS[alternative](t_stat, df)
 
     return p, t_stat, df
 
@@ -182,13 +189,8 @@ def welch_p_value_manual(
     """
     t_stat, df, _ = welch_t_stat(x, y)
 
-    # Расчёт p-value в зависимости от направления теста
-    if alternative == 'two-sided':
-        p: float = 2 * (1 - st.t.cdf(abs(t_stat), df))
-    elif alternative == 'greater':
-        p = 1 - st.t.cdf(t_stat, df)
-    else:  # 'less'
-        p = st.t.cdf(t_stat, df)
+    # Вычисляем p-значение в зависимости от направления альтернативы
+    p: float = _T_TAILS[alternative](t_stat, df)
 
     return p, t_stat, df
 
@@ -226,3 +228,71 @@ def welch_p_value(
 
     return p, t_stat, df
 
+
+def welch_t_stat_batch(X: np.ndarray, Y: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисляет t-статистики Welch's t-теста сразу для набора экспериментов.
+
+    Каждая строка матриц X и Y — отдельный эксперимент; средние и дисперсии
+    считаются векторно по оси 1, без цикла на Python по экспериментам.
+
+    Args:
+        X (np.ndarray): Матрица наблюдений первой выборки формы (m, n_x).
+        Y (np.ndarray): Матрица наблюдений второй выборки формы (m, n_y).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - t_stat (np.ndarray): значения t-статистик, форма (m,);
+            - df (np.ndarray): числа степеней свободы по формуле Уэлча-Саттеруэйта;
+            - se (np.ndarray): стандартные ошибки разности средних.
+    """
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+
+    # Размеры выборок (одинаковы для всех экспериментов)
+    nx, ny = X.shape[1], Y.shape[1]
+
+    # Средние и несмещённые дисперсии по каждой строке
+    mx, my = X.mean(axis = 1), Y.mean(axis = 1)
+    vx, vy = X.var(axis = 1, ddof = 1), Y.var(axis = 1, ddof = 1)
+
+    # Стандартные ошибки и t-статистики
+    se = np.sqrt(vx / nx + vy / ny)
+    t_stat = (mx - my) / se
+
+    # Степени свободы по формуле Уэлча-Саттеруэйта (поэлементно)
+    df_num = (vx / nx + vy / ny) ** 2
+    df_den = (vx**2 / (nx**2 * (nx - 1))) + (vy**2 / (ny**2 * (ny - 1)))
+    df = df_num / df_den
+
+    return t_stat, df, se
+
+
+def welch_p_value_batch(
+    X: np.ndarray, Y: np.ndarray, alternative: str = 'two-sided'
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисляет p-value Welch's t-теста сразу для набора экспериментов.
+
+    Векторный аналог `welch_p_value_manual`: строки матриц X и Y — отдельные эксперименты.
+
+    Args:
+        X (np.ndarray): Матрица наблюдений первой выборки формы (m, n_x).
+        Y (np.ndarray): Матрица наблюдений второй выборки формы (m, n_y).
+        alternative (str, optional): Направление альтернативной гипотезы. 
+            Возможные значения: 'two-sided', 'greater', 'less'. 
+            По умолчанию 'two-sided'.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            - p (np.ndarray): p-value для каждого эксперимента;
+            - t_stat (np.ndarray): рассчитанные t-статистики;
+            - df (np.ndarray): числа степеней свободы.
+    """
+    t_stat, df, _ = welch_t_stat_batch(X, Y)
+
+    # Вычисляем p-значение в зависимости от направления альтернативы
+    p = _T_TAILS[alternative](t_stat, df)
+
+    return p, t_stat, df
+
@@ -1,6 +1,19 @@
 import numpy as np
-import scipy.stats as st
-from statsmodels.stats.weightstats import ztest
+from scipy.special import ndtr
+from typing import Callable
+
+
+# P-значение z-теста по направлению альтернативы.
+# ndtr(z) — CDF стандартного нормального распределения без накладных расходов scipy.stats
+_Z_TAILS: dict[str, Callable] = {
+    # Двусторонний тест: учитываем оба хвоста распределения
+    'two-sided': lambda z_stat: 2 * ndtr(-np.abs(z_stat)),
+    # Правосторонний тест: вероятность получить z больше наблюдаемого
+    'greater': lambda z_stat: ndtr(-z_stat),
+    # Левосторонний тест: вероятность получить z меньше наблюдаемого
+    'less': lambda z_stat: ndtr(z_stat),
+}
+
 
 def ztest_prop_stat(
     x1: int, n1: int, x2: int, n2: int
@@ -68,15 +81,41 @@ def ztest_prop_p_value_manual(
     z_stat, *_ = ztest_prop_stat(x1, n1, x2, n2)
 
     # Вычисляем p-value в зависимости от направления альтернативы
-    if alternative == 'two-sided':
-        # Двусторонний тест: учитываем оба хвоста распределения
-        p: float = 2 * (1 - st.norm.cdf(abs(z_stat)))
-    elif alternative == 'greater':
-        # Правосторонний тест: вероятность получить z больше наблюдаемого
-        p = 1 - st.norm.cdf(z_stat)
-    else:
-        # Левосторонний тест: вероятность получить z меньше наблюдаемого
-        p = st.norm.cdf(z_stat)
+    p: float = _Z_TAILS[alternative](z_stat)
+
+    return p, z_stat
+
+
+def ztest_prop_p_value_batch(
+    x1: np.ndarray, n1: np.ndarray, x2: np.ndarray, n2: np.ndarray, alternative: str = 'two-sided'
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Вычисляет p-value двухвыборочного z-теста пропорций сразу для набора экспериментов.
+
+    Векторный аналог `ztest_prop_p_value_manual`: i-е элементы массивов
+    описывают i-й эксперимент, расчёт выполняется без цикла на Python.
+
+    Args:
+        x1 (np.ndarray): Числа успехов в первой группе.
+        n1 (np.ndarray): Общие числа испытаний в первой группе.
+        x2 (np.ndarray): Числа успехов во второй группе.
+        n2 (np.ndarray): Общие числа испытаний во второй группе.
+        alternative (str, optional): Тип альтернативной гипотезы:
+            - 'two-sided' (по умолчанию) — p₁ ≠ p₂,
+            - 'greater' — p₁ > p₂,
+            - 'less' — p₁ < p₂.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            - p (np.ndarray): p-value для каждого эксперимента;
+            - z_stat (np.ndarray): рассчитанные z-статистики.
+    """
+    z_stat, *_ = ztest_prop_stat(
+        np.asarray(x1), np.asarray(n1), np.asarray(x2), np.asarray(n2)
+    )
+
+    # Вычисляем p-value в зависимости от направления альтернативы
+    p = _Z_TAILS[alternative](z_stat)
 
     return p, z_stat
 
@@ -86,10 +125,17 @@ def ztest_prop_p_value(
 ) -> tuple[float, float]:
     """
     Вычисляет z-статистику и p-value для двухвыборочного z-теста пропорций
-    с использованием библиотеки SciPy.
+    по массивам конверсий (0/1) каждой группы.
 
-    Использует нормальное распределение для оценки значимости разницы
-    между двумя пропорциями.
+    Массивы сводятся к числу успехов и размеру групп, после чего
+    используется объединённая (pooled) пропорция, как в `ztest_prop_p_value_manual`.
+
+    Ранее функция вызывала statsmodels `ztest(usevar='pooled')`, где стандартная
+    ошибка строится по объединённой внутригрупповой дисперсии, а не по объединённой
+    пропорции. Поэтому p-value немного изменились: например, для 30/100 против 20/100
+    двустороннее p-value было 0.1002, теперь 0.1025. Результат совпадает с
+    `ztest_prop_p_value_manual` и с критерием хи-квадрат без поправки Йейтса
+    (scipy.stats.chi2_contingency(..., correction=False)).
 
     Args:
         x1_arr (np.ndarray): Массив конверсий первой группы.
@@ -102,19 +148,15 @@ def ztest_prop_p_value(
 
     Returns:
         tuple[float, float]:
-            - z_stat (float): z-статистика теста,
-            - p_value (float): p-value критерия.
+            - p_value (float): p-value критерия,
+            - z_stat (float): z-статистика теста.
     """
-    statsmodels_alternative = 'two-sided' if alternative == 'two-sided' else ('larger' if alternative == 'greater' else 'smaller')
-
-    z_stat, p_value = ztest(
-        x1 = x1_arr,
-        x2 = x2_arr,
-        value = 0,
-        alternative = statsmodels_alternative,
-        usevar = 'pooled',
-        ddof = 0
+    z_stat, *_ = ztest_prop_stat(
+        int(np.sum(x1_arr)), len(x1_arr), int(np.sum(x2_arr)), len(x2_arr)
     )
 
+    # Вычисляем p-value в зависимости от направления альтернативы
+    p_value: float = _Z_TAILS[alternative](z_stat)
+
     return p_value, z_stat
 